@@ -1,140 +1,194 @@
 import os
+import json
+import hashlib
+import queue
 import time
+import threading
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 import logging
 from logging.handlers import TimedRotatingFileHandler
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import email.policy
+from email.message import EmailMessage
 import smtplib
 import configparser
-from typing import Any, Dict, List, Optional
+import types
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple
 
+try:
+    import orjson  # Optional, faster JSON parser
+except ImportError:
+    orjson = None
 
+try:
+    import xxhash  # Optional, faster hash for detecting unchanged responses
+except ImportError:
+    xxhash = None
+
+
+@dataclass(frozen=True)
 class Config:
     """
-    A class to parse and manage configurations from a config.ini file.
+    Immutable settings parsed from a config.ini file.
     """
 
-    def __init__(self, config_file: str = "config.ini"):
-        """
-        Initializes the Config object by reading the config.ini file.
-
-        Args:
-            config_file (str): The path to the configuration file. Defaults to "config.ini".
-        """
-        self.config: configparser.ConfigParser = configparser.ConfigParser(
-            interpolation=None
-        )  # Disable interpolation to prevent configparser from treating the % character as a special character for variable substitution
-        self.config.read(config_file)
-        self.base_api_url: str = self.config.get("API", "base_api_url")
-        self.locale: str = self.config.get("API", "locale")
-        self.inventory_api_url: str = self.config.get("API", "inventory_api_url")
-        self.api_url: str = self.build_api_url()  # Build the full URL
-        self.request_headers: Dict[str, str] = self._get_headers("Headers")
-        self.inventory_request_headers: Dict[str, str] = self._get_inventory_headers() # Fix 2: Add inventory headers
-        self.test_email_subject: str = self.config.get("Email", "test_email_subject")
-        self.product_email_subject: str = self.config.get("Email", "product_email_subject")
-        self.down_email_subject: str = self.config.get("Email", "down_email_subject")
-        self.email_user: str = self.config.get("Email", "email_user")
-        self.email_password: str = self.config.get("Email", "email_password")
-        self.email_recipient: str = self.config.get("Email", "email_recipient")
-        self.manufacturer: str = self.config.get("General", "manufacturer")
-        # Get and process the list of GPUs to monitor
-        self.gpus_to_monitor: List[str] = [
-            gpu.strip() for gpu in self.config.get("General", "GPU").split(",")
-        ]
-        logger.debug(f"Monitoring GPUs: {self.gpus_to_monitor}")
-        self.check_interval: int = self.config.getint("General", "check_interval")
-        self.max_failures: int = self.config.getint("General", "max_failures")
-        self.last_known_skus: Dict[str, str] = {}  # Initialize last_known_skus, {gpu: sku}
-        self.sku_changed: Dict[str, bool] = {} # {gpu: bool}
-
-        for gpu in self.gpus_to_monitor:
-            self.last_known_skus[gpu] = ""  # Initialize last_known_skus for each GPU
-            self.sku_changed[gpu] = False
-
-    def _get_headers(self, section: str) -> Dict[str, str]:
-        """Retrieves header values from specified section.
-
-        Args:
-            section (str): The section in the config file (e.g., "Headers").
-
-        Returns:
-            Dict[str, str]: A dictionary of headers.
-        """
-        headers: Dict[str, str] = {}
-        for key, value in self.config.items(section):
-            headers[key] = value
-        logger.debug(f"Request Headers: {headers}")
-        return headers
-
-    def get_headers(self) -> Dict[str, str]:
+    base_api_url: str
+    locale: str
+    inventory_api_url: str
+    inventory_url_tmpl: str  # inventory_api_url with the locale filled in, leaving {sku}
+    inventory_path_tmpl: str  # Inventory request path with the locale filled in, leaving {sku}
+    events_url: str
+    api_url: str
+    request_headers: Mapping[str, str]
+    inventory_request_headers: Mapping[str, str]
+    test_email_subject: str
+    product_email_subject: str
+    down_email_subject: str
+    email_user: str
+    email_password: str
+    email_recipient: str
+    email_configured: bool  # True when email_user, email_password and email_recipient are all set
+    manufacturer: str
+    gpus_to_monitor: FrozenSet[str]
+    check_interval: int
+    max_failures: int
+    mode: str
+    cache_ttl: int
+
+    def get_headers(self) -> Mapping[str, str]:
         """Get the request headers for main API.
 
         Returns:
-            Dict[str, str]: The request headers.
+            Mapping[str, str]: The read-only request headers.
         """
         return self.request_headers
 
-    def _get_inventory_headers(self) -> Dict[str, str]:
-        """Returns specific headers for Inventory API requests."""
-        return {
-            "authority": "api.store.nvidia.com",
-            "method": "GET",
-            "path": "/partner/v1/feinventory?status=1&skus={sku}&locale={locale}", # Path will be updated in check_inventory_api
-            "scheme": "https",
-            "accept": "application/json, text/javascript, */*; q=0.01",
-            "accept-encoding": "gzip, deflate, br, zstd",
-            "accept-language": "en-US,en;q=0.9,sv;q=0.8",
-            "content-type": "application/json",
-            "origin": "https://marketplace.nvidia.com",
-            "priority": "u=1, i",
-            "referer": "https://marketplace.nvidia.com/",
-            "sec-ch-ua": '"Not A(Brand";v="8", "Chromium";v="132", "Microsoft Edge";v="132"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"macOS"',
-            "sec-fetch-dest": "empty",
-            "sec-fetch-mode": "cors",
-            "sec-fetch-site": "same-site",
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36 Edg/132.0.0.0",
-        }
-
-
-    def get_inventory_headers(self) -> Dict[str, str]:
+    def get_inventory_headers(self, sku: str) -> Dict[str, str]:
         """Get the request headers for inventory API.
 
-        Returns:
-            Dict[str, str]: The inventory request headers.
-        """
-        return self.inventory_request_headers
-
-
-    def build_api_url(self) -> str:
-        """Builds the full API URL using the base URL and locale.
+        Args:
+            sku (str): The product SKU the request is for, or several comma-separated SKUs.
 
         Returns:
-            str: The complete API URL.
+            Dict[str, str]: A new dict of inventory request headers with the path filled in.
         """
-
-        # Construct the URL, replacing the locale
-        url: str = self.base_api_url.replace("{locale}", self.locale)
-
-        logger.debug(f"Constructed API URL: {url}")
-        return url
+        return {
+            **self.inventory_request_headers,
+            "path": self.inventory_path_tmpl.replace("{sku}", sku),
+        }
 
     def build_inventory_api_url(self, sku: str) -> str:
         """Builds the inventory API URL with the given SKU and locale.
 
         Args:
-            sku (str): The product SKU.
+            sku (str): The product SKU, or several comma-separated SKUs.
 
         Returns:
             str: The constructed inventory API URL.
         """
-        url: str = self.inventory_api_url.replace("{locale}", self.locale).replace("{sku}", sku)
-        logger.debug(f"Constructed Inventory API URL: {url}")
+        url: str = self.inventory_url_tmpl.replace("{sku}", sku)
+        logger.debug("Constructed Inventory API URL: %s", url)
         return url
 
+
+def _get_headers(parser: configparser.ConfigParser, section: str) -> Dict[str, str]:
+    """Retrieves header values from specified section.
+
+    Args:
+        parser (configparser.ConfigParser): The parsed configuration.
+        section (str): The section in the config file (e.g., "Headers").
+
+    Returns:
+        Dict[str, str]: A dictionary of headers.
+    """
+    headers: Dict[str, str] = dict(parser.items(section))
+    logger.debug("Request Headers: %s", headers)
+    return headers
+
+
+def _get_inventory_headers() -> Dict[str, str]:
+    """Returns specific headers for Inventory API requests."""
+    return {
+        "authority": "api.store.nvidia.com",
+        "method": "GET",
+        "path": "/partner/v1/feinventory", # Path with SKU and locale is set per request in get_inventory_headers
+        "scheme": "https",
+        "accept": "application/json, text/javascript, */*; q=0.01",
+        "accept-encoding": ACCEPT_ENCODING,
+        "accept-language": "en-US,en;q=0.9,sv;q=0.8",
+        "content-type": "application/json",
+        "origin": "https://marketplace.nvidia.com",
+        "priority": "u=1, i",
+        "referer": "https://marketplace.nvidia.com/",
+        "sec-ch-ua": '"Not A(Brand";v="8", "Chromium";v="132", "Microsoft Edge";v="132"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"macOS"',
+        "sec-fetch-dest": "empty",
+        "sec-fetch-mode": "cors",
+        "sec-fetch-site": "same-site",
+        "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36 Edg/132.0.0.0",
+    }
+
+
+def _load_config(config_file: str = "config.ini") -> Config:
+    """Reads the config.ini file once and builds the Config from it.
+
+    Args:
+        config_file (str): The path to the configuration file. Defaults to "config.ini".
+
+    Returns:
+        Config: The loaded configuration.
+    """
+    parser: configparser.ConfigParser = configparser.ConfigParser(
+        interpolation=None
+    )  # Disable interpolation to prevent configparser from treating the % character as a special character for variable substitution
+    parser.read(config_file)
+
+    base_api_url: str = parser.get("API", "base_api_url")
+    locale: str = parser.get("API", "locale")
+    inventory_api_url: str = parser.get("API", "inventory_api_url")
+    # Construct the URLs, replacing the locale once so only the SKU is filled in per request
+    api_url: str = base_api_url.replace("{locale}", locale)
+    logger.debug("Constructed API URL: %s", api_url)
+
+    email_user: str = parser.get("Email", "email_user")
+    email_password: str = parser.get("Email", "email_password")
+    email_recipient: str = parser.get("Email", "email_recipient")
+
+    # Get and process the list of GPUs to monitor
+    gpus_to_monitor: FrozenSet[str] = frozenset(gpu.strip() for gpu in parser.get("General", "GPU").split(","))
+    logger.debug("Monitoring GPUs: %s", gpus_to_monitor)
+
+    return Config(
+        base_api_url=base_api_url,
+        locale=locale,
+        inventory_api_url=inventory_api_url,
+        inventory_url_tmpl=inventory_api_url.replace("{locale}", locale),
+        inventory_path_tmpl="/partner/v1/feinventory?status=1&skus={sku}&locale={locale}".replace("{locale}", locale),
+        events_url=parser.get("API", "events_url", fallback=""),
+        api_url=api_url,
+        # Only offer the encodings urllib3 can decode (br and zstd need the brotli and zstandard packages)
+        request_headers=types.MappingProxyType({**_get_headers(parser, "Headers"), "accept-encoding": ACCEPT_ENCODING}),
+        inventory_request_headers=types.MappingProxyType(_get_inventory_headers()), # Fix 2: Add inventory headers
+        test_email_subject=parser.get("Email", "test_email_subject"),
+        product_email_subject=parser.get("Email", "product_email_subject"),
+        down_email_subject=parser.get("Email", "down_email_subject"),
+        email_user=email_user,
+        email_password=email_password,
+        email_recipient=email_recipient,
+        email_configured=bool(email_user and email_password and email_recipient),
+        manufacturer=parser.get("General", "manufacturer"),
+        gpus_to_monitor=gpus_to_monitor,
+        check_interval=parser.getint("General", "check_interval"),
+        max_failures=parser.getint("General", "max_failures"),
+        mode=parser.get("General", "mode", fallback="poll").strip().lower(),
+        cache_ttl=parser.getint("General", "cache_ttl", fallback=10),
+    )
+
 # Logger setup
 def setup_logger() -> logging.Logger:
     """Sets up a logger that logs to both console and a daily rotating file.
@@ -164,182 +218,733 @@ def setup_logger() -> logging.Logger:
 logger: logging.Logger = setup_logger()
 
 # Load configuration
-config: Config = Config()
+config: Config = _load_config()
 
 
-def send_email(subject: str, body: str, html: bool = True) -> None:
-    """Sends an email using Gmail's SMTP server.
+class CappedRetry(Retry):
+    """
+    A urllib3 Retry that honours Retry-After headers for at most check_interval seconds.
+
+    urllib3 does not cap Retry-After, so a server asking for an hour would otherwise block
+    the monitoring loop for that long on every retry.
+    """
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after: Optional[float] = super().get_retry_after(response)
+        if retry_after is not None and retry_after > config.check_interval:
+            logger.warning(
+                "Server asked to retry after %s seconds; waiting %s seconds instead.", retry_after, config.check_interval
+            )
+            return float(config.check_interval)
+        return retry_after
+
+
+def create_session() -> requests.Session:
+    """Creates an HTTP session that keeps connections alive between API checks.
+
+    Returns:
+        requests.Session: Session with a pooled, retrying HTTPS adapter mounted.
+    """
+    session: requests.Session = requests.Session()
+    # Transient errors and rate limits (honouring a capped Retry-After) are retried here, so
+    # the failure count in the main loop only sees calls that failed after every retry
+    retries: Retry = CappedRetry(
+        total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"]
+    )
+    adapter: HTTPAdapter = HTTPAdapter(pool_connections=2, pool_maxsize=10, max_retries=retries)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session so every poll reuses the open TCP/TLS connections to both API hosts
+SESSION: requests.Session = create_session()
+
+# Last ETag, Last-Modified, body hash and parsed JSON per URL, used to revalidate instead of
+# re-downloading and to skip parsing a body identical to the previous one
+_conditional_cache: Dict[str, Tuple[Optional[str], Optional[str], int, Any]] = {}
+
+# Parsed JSON and body hash per URL with the monotonic time it was fetched, filled ahead of each check
+_response_cache: Dict[str, Tuple[Any, int, float]] = {}
+_refreshing: Set[str] = set()
+_refresh_lock: threading.Lock = threading.Lock()
+# Per URL: set when its running background refresh finishes, and the error of a refresh that failed
+_in_flight: Dict[str, threading.Event] = {}
+_refresh_errors: Dict[str, requests.exceptions.RequestException] = {}
+
+# Returned by check_api when the response is identical to the last one processed successfully
+UNCHANGED: object = object()
+_last_api_hash: Optional[int] = None  # Hash of the last search response processed successfully
+_returned_api_hash: Optional[int] = None  # Hash of the search response check_api last returned
+
+# SKU tracking state, updated while monitoring
+last_known_skus: Dict[str, str] = {gpu: "" for gpu in config.gpus_to_monitor}  # {gpu: sku}
+sku_changed: Dict[str, bool] = {gpu: False for gpu in config.gpus_to_monitor}  # {gpu: bool}
+tracked_products: Dict[str, Any] = {}  # {gpu: product} from the latest API response
+
+# SMTP connection kept open between alerts so each email skips the TLS handshake and login
+_smtp: Optional[smtplib.SMTP] = None
+SMTP_TIMEOUT: int = 10  # Seconds
+
+
+def _close_smtp() -> None:
+    """Closes the shared SMTP connection, ignoring errors from an already dropped connection."""
+    global _smtp
+    if _smtp is not None:
+        try:
+            _smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            _smtp.close()
+        _smtp = None
+
+
+def _get_smtp() -> smtplib.SMTP:
+    """Returns a logged-in SMTP connection, reconnecting if the previous one was dropped.
+
+    Returns:
+        smtplib.SMTP: The shared SMTP connection.
+    """
+    global _smtp
+    if _smtp is not None:
+        try:
+            if _smtp.noop()[0] == 250:
+                return _smtp
+        except (smtplib.SMTPException, OSError):
+            pass
+        logger.debug("SMTP connection lost. Reconnecting.")
+        _close_smtp()
+
+    # The timeout keeps a half-open connection from blocking the monitoring loop
+    server: smtplib.SMTP = smtplib.SMTP("smtp.gmail.com", 587, timeout=SMTP_TIMEOUT)
+    try:
+        server.ehlo()
+        server.starttls()
+        server.login(config.email_user, config.email_password)
+    except BaseException:
+        server.close()
+        raise
+    _smtp = server
+    return server
+
+
+def _format_email(subject: str, body: str, html: bool = True) -> bytes:
+    """Builds a single-part email message.
 
     Args:
         subject (str): The email subject.
         body (str): The email body.
         html (bool, optional): Whether the email body is HTML. Defaults to True.
+
+    Returns:
+        bytes: The serialized message, ready to be sent.
     """
+    message: EmailMessage = EmailMessage()
+    message["From"] = config.email_user
+    message["To"] = config.email_recipient
+    message["Subject"] = subject
+    message.set_content(body, subtype="html" if html else "plain")
+    return message.as_bytes(policy=email.policy.SMTP)  # SMTP requires CRLF line endings
+
+
+def _send_message(subject: str, message: bytes) -> None:
+    """Sends a formatted message using Gmail's SMTP server.
 
-    if not all([config.email_user, config.email_password, config.email_recipient]):
+    Args:
+        subject (str): The email subject, for logging.
+        message (bytes): The serialized message.
+    """
+    if not config.email_configured:
         logger.error("email_user, email_password, and email_recipient must be set in config.ini.")
         return
 
-    logger.info(f"Preparing to send email to {config.email_recipient} with subject '{subject}'.")
+    logger.info("Preparing to send email to %s with subject '%s'.", config.email_recipient, subject)
+    try:
+        try:
+            _get_smtp().sendmail(config.email_user, config.email_recipient, message)
+        except smtplib.SMTPServerDisconnected:
+            # The server may drop the connection between the NOOP check and the send
+            _close_smtp()
+            _get_smtp().sendmail(config.email_user, config.email_recipient, message)
+        logger.info("Email sent successfully.")
+    except Exception as e:
+        logger.error("Error sending email: %s", e)
+
+
+def send_email(subject: str, body: str, html: bool = True) -> None:
+    """Sends an email using Gmail's SMTP server.
+
+    Args:
+        subject (str): The email subject.
+        body (str): The email body.
+        html (bool, optional): Whether the email body is HTML. Defaults to True.
+    """
     try:
-        message: MIMEMultipart = MIMEMultipart()
-        message["From"] = config.email_user
-        message["To"] = config.email_recipient
-        message["Subject"] = subject
-
-        mime_type: str = "html" if html else "plain"
-        message.attach(MIMEText(body, mime_type))
-
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.ehlo()
-            server.starttls()
-            server.login(config.email_user, config.email_password)
-            server.send_message(message)
-            logger.info("Email sent successfully.")
+        message: bytes = _format_email(subject, body, html)
     except Exception as e:
-        logger.error(f"Error sending email: {e}")
+        logger.error("Error sending email: %s", e)
+        return
+    _send_message(subject, message)
+
+
+# The API down alert never changes, so it is formatted once
+_DOWN_EMAIL: bytes = _format_email(
+    config.down_email_subject, "<p>Alert: The API is down. Please check the API status and connectivity.</p>"
+)
+
+
+def send_down_email() -> None:
+    """Sends the API down alert."""
+    _send_message(config.down_email_subject, _DOWN_EMAIL)
+
+
+def _parse_json(response: requests.Response) -> Any:
+    """Parses the response body as JSON, using orjson when it is installed.
+
+    Args:
+        response (requests.Response): The response to parse.
+
+    Returns:
+        Any: The parsed JSON data.
+
+    Raises:
+        requests.exceptions.InvalidJSONError: If the body is not valid JSON.
+    """
+    if orjson is None:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(f"Invalid JSON in response: {e}", response=response)
+
+
+def _content_hash(content: bytes) -> int:
+    """Hashes a response body, using xxhash when it is installed.
+
+    Args:
+        content (bytes): The response body.
+
+    Returns:
+        int: A 64-bit hash of the body.
+    """
+    if xxhash is None:
+        return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), "little")
+    return xxhash.xxh3_64_intdigest(content)
+
+
+def conditional_get(url: str, headers: Mapping[str, str]) -> Tuple[requests.Response, Any, int]:
+    """Performs a GET that revalidates against the previous response for the same URL.
+
+    Sends If-None-Match / If-Modified-Since when the last response carried an ETag or
+    Last-Modified header. A 304 reuses the previously parsed JSON without reading a body,
+    and a body with the same hash as the previous one is not parsed again.
+
+    Args:
+        url (str): The URL to request.
+        headers (Mapping[str, str]): The request headers.
+
+    Returns:
+        Tuple[requests.Response, Any, int]: The response, its (possibly cached) JSON data and the body hash.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+    """
+    etag, last_modified, cached_hash, cached_json = _conditional_cache.get(url, (None, None, None, None))
+    if etag or last_modified:
+        headers = dict(headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response: requests.Response = SESSION.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    if response.status_code == 304 and cached_hash is not None:
+        return response, cached_json, cached_hash
+
+    body_hash: int = _content_hash(response.content)
+    json_data: Any = cached_json if body_hash == cached_hash else _parse_json(response)
+    _conditional_cache[url] = (response.headers.get("ETag"), response.headers.get("Last-Modified"), body_hash, json_data)
+    return response, json_data, body_hash
+
+
+def _fetch(url: str, headers: Mapping[str, str]) -> Tuple[Any, int]:
+    """Fetches the URL and logs the size of the response.
+
+    Args:
+        url (str): The URL to request.
+        headers (Mapping[str, str]): The request headers.
+
+    Returns:
+        Tuple[Any, int]: The JSON data and the hash of the body it was parsed from.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+    """
+    response, json_data, body_hash = conditional_get(url, headers)
+    if logger.isEnabledFor(logging.DEBUG):
+        # Log the size rather than the body; the search response is far too large for the log file
+        logger.debug(
+            "Fetched %s. Status Code: %d, Content-Encoding: %s, json_bytes=%d",
+            url, response.status_code, response.headers.get("Content-Encoding", "identity"), len(response.content),
+        )
+    return json_data, body_hash
+
+
+def _fetch_into_cache(url: str, headers: Mapping[str, str]) -> Tuple[Any, int]:
+    """Fetches the URL and stores the JSON in the response cache.
+
+    Args:
+        url (str): The URL to request.
+        headers (Mapping[str, str]): The request headers.
+
+    Returns:
+        Tuple[Any, int]: The JSON data and the hash of the body it was parsed from.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+    """
+    json_data, body_hash = _fetch(url, headers)
+    _response_cache[url] = (json_data, body_hash, time.monotonic())
+    return json_data, body_hash
+
+
+def _refresh(url: str, headers: Mapping[str, str]) -> None:
+    """Refreshes a cache entry in the background.
+
+    Args:
+        url (str): The URL to refresh.
+        headers (Mapping[str, str]): The request headers.
+    """
+    done: threading.Event = threading.Event()
+    with _refresh_lock:
+        _in_flight[url] = done
+        _refresh_errors.pop(url, None)
+    try:
+        _fetch_into_cache(url, headers)
+    except requests.exceptions.RequestException as e:
+        logger.warning("Background refresh of %s failed: %s", url, e)
+        with _refresh_lock:
+            _refresh_errors[url] = e
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(url)
+            del _in_flight[url]
+        done.set()
+
+
+def max_cache_age() -> float:
+    """Returns how old a cached response may be and still be used by a check.
+
+    Capped at half the check interval, so a check never reuses the response the previous
+    check already acted on.
+
+    Returns:
+        float: The maximum age in seconds.
+    """
+    return min(config.cache_ttl, config.check_interval / 2)
+
+
+def schedule_refresh(url: str, headers: Mapping[str, str], delay: float) -> None:
+    """Refreshes the cached response for the URL in the background after a delay.
+
+    Used to fetch the search response shortly before the next check, so the check reads
+    fresh data without waiting for the network.
+
+    Args:
+        url (str): The URL to refresh.
+        headers (Mapping[str, str]): The request headers.
+        delay (float): Seconds to wait before fetching.
+    """
+    with _refresh_lock:
+        if url in _refreshing:
+            return
+        _refreshing.add(url)
+    timer: threading.Timer = threading.Timer(delay, _refresh, args=(url, headers))
+    timer.daemon = True
+    timer.start()
+
+
+def cached_get(url: str, headers: Mapping[str, str]) -> Tuple[Any, int]:
+    """Returns the JSON for the URL, using a response fetched ahead of time when it is recent.
+
+    A cached response is only used while it is younger than max_cache_age(); otherwise the URL
+    is fetched before returning, so stock decisions are never made on data from an earlier check.
+    A background refresh of the URL that is still running is waited for (up to check_interval)
+    instead of sending a second request alongside it, and its failure is this call's failure.
+
+    Args:
+        url (str): The URL to request.
+        headers (Mapping[str, str]): The request headers.
+
+    Returns:
+        Tuple[Any, int]: The JSON data and the hash of the body it was parsed from.
+
+    Raises:
+        requests.exceptions.RequestException: If the fetch or the refresh it waited for fails.
+    """
+    with _refresh_lock:
+        done: Optional[threading.Event] = _in_flight.get(url)
+    if done is not None and not done.wait(config.check_interval):
+        raise requests.exceptions.Timeout(f"Background refresh of {url} is still running.")
+
+    with _refresh_lock:
+        refresh_error: Optional[requests.exceptions.RequestException] = _refresh_errors.pop(url, None)
+    entry: Optional[Tuple[Any, int, float]] = _response_cache.get(url)
+    if entry is not None:
+        json_data, body_hash, fetched_at = entry
+        if time.monotonic() - fetched_at < max_cache_age():
+            return json_data, body_hash
+    if refresh_error is not None:
+        # The refresh for this check already went through the retries; don't repeat them now
+        raise refresh_error
+    return _fetch_into_cache(url, headers)
 
 
 def check_api() -> Any:
     """Calls the API and returns the JSON response.
 
     Returns:
-        Any: The JSON response if successful; otherwise, None.
+        Any: The JSON response if successful, UNCHANGED if it is identical to the last response
+        processed successfully (see mark_api_response_processed); otherwise, None.
     """
+    global _returned_api_hash
     try:
-        response: requests.Response = requests.get(config.api_url, headers=config.get_headers(), timeout=10)
-        response.raise_for_status()
-        json_data: Any = response.json()
-        logger.debug(f"API call successful. Status Code: {response.status_code},  JSON data received: {json_data}")
+        json_data, body_hash = cached_get(config.api_url, config.get_headers())
+        logger.debug("API call successful.")
+        if body_hash == _last_api_hash:
+            return UNCHANGED
+        _returned_api_hash = body_hash
         return json_data
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error during API call: {e}")
+        logger.error("Error during API call: %s", e)
         return None
 
-def check_inventory_api(sku: str) -> bool:
-    """Checks the inventory API for the given SKU.
+def mark_api_response_processed() -> None:
+    """Records the response check_api last returned as processed, so identical ones are skipped."""
+    global _last_api_hash
+    _last_api_hash = _returned_api_hash
+
+def check_inventory_api_batch(skus: List[str]) -> Dict[str, bool]:
+    """Checks the inventory API for all given SKUs in a single request.
 
     Args:
-        sku (str): The product SKU.
+        skus (List[str]): The product SKUs.
 
     Returns:
-        bool: True if the product is active, False otherwise.
+        Dict[str, bool]: Maps each SKU to True if the product is active, False otherwise.
     """
-    url: str = config.build_inventory_api_url(sku)
-    inventory_headers: Dict[str, str] = config.get_inventory_headers()
-    inventory_headers['path'] = inventory_headers['path'].replace("{sku}", sku).replace("{locale}", config.locale) # Fix 3: Updated to use 'path' instead of ':path' # Fix 2: Update path with sku and locale
-    inventory_headers['method'] = "GET"
-    inventory_headers['scheme'] = "https"
-    inventory_headers['authority'] = "api.store.nvidia.com"
+    statuses: Dict[str, bool] = {sku: False for sku in skus}
+    sku_list: str = ",".join(skus)
+    url: str = config.build_inventory_api_url(sku_list)
+    inventory_headers: Dict[str, str] = config.get_inventory_headers(sku_list) # Fix 3: Uses 'path' instead of ':path'
 
-
-    logger.debug(f"Inventory API Headers: {inventory_headers}")
+    logger.debug("Inventory API Headers: %s", inventory_headers)
 
     try:
-        response: requests.Response = requests.get(url, headers=inventory_headers, timeout=10)
-        response.raise_for_status()
-        json_data: Any = response.json()
-        logger.debug(f"Inventory API call successful. Status Code: {response.status_code}, JSON data: {json_data}")
-
-        is_active: str = json_data.get("listMap", [{}])[0].get("is_active", "false")
-        return is_active == "true"
+        # Always fetched inline: this response decides whether the stock alert is sent
+        json_data, _ = _fetch(url, inventory_headers)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Inventory API call successful. JSON data: %s", json_data)
+
+        list_map: List[Any] = json_data.get("listMap") or []
+        matched: Dict[str, bool] = {}
+        unmatched: List[Tuple[int, str, bool]] = []  # (position, fe_sku, is_active)
+        for position, item in enumerate(list_map):
+            # fe_sku is normally the requested SKU with a locale suffix (e.g. "SKU_SE")
+            fe_sku: str = item.get("fe_sku", "")
+            is_active: bool = item.get("is_active", "false") == "true"
+            sku: str = fe_sku if fe_sku in statuses else fe_sku.rsplit("_", 1)[0]
+            if sku in statuses and sku not in matched:
+                matched[sku] = is_active
+            else:
+                unmatched.append((position, fe_sku, is_active))
+
+        # Only trust positions when no entry matched by name (and there is one entry per SKU) or a single SKU was requested
+        by_position: bool = (not matched and len(list_map) == len(skus)) or len(skus) == 1
+        for position, fe_sku, is_active in unmatched:
+            if by_position and position < len(skus) and skus[position] not in matched:
+                logger.debug("Matching fe_sku '%s' to requested SKU %s by position.", fe_sku, skus[position])
+                matched[skus[position]] = is_active
+            else:
+                logger.warning("Inventory API returned fe_sku '%s' that matches none of the remaining requested SKUs %s.", fe_sku, skus)
+
+        statuses.update(matched)
+        return statuses
 
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error during Inventory API call: {e}")
-        return False
+        logger.error("Error during Inventory API call: %s", e)
+        return statuses
 
-def process_api_response(api_response: Any) -> None:
-    """Processes the initial API response to extract and check product SKUs.
+def process_api_response(api_response: Any) -> bool:
+    """Processes the initial API response to extract product SKUs and detect SKU changes.
 
     Args:
         api_response (Any): The JSON response from the initial API call.
+
+    Returns:
+        bool: True if the response was processed, False if processing failed.
     """
+    tracked_products.clear()
     try:
         products: Any = api_response.get("searchedProducts", {}).get("productDetails", [])
         if not products:
             logger.warning("No product details found in the API response.")
-            return
+            return True
 
-        for product in products:
-            gpu: str = product.get("gpu", "")
-            manufacturer: str = product.get("manufacturer", "")
+        # Index the manufacturer's products by GPU so only the monitored GPUs are looked at
+        by_gpu: Dict[str, Any] = {
+            product.get("gpu", ""): product for product in products if product.get("manufacturer", "") == config.manufacturer
+        }
+
+        for gpu in config.gpus_to_monitor:
+            product: Any = by_gpu.get(gpu)
+            if not product:
+                continue
+            tracked_products[gpu] = product
             product_sku: str = product.get("productSKU", "")
+            last_sku: str = last_known_skus.get(gpu, "")
 
             logger.debug(
-                f"Checking product: {product.get('productTitle')}, GPU: {gpu}, Manufacturer: {manufacturer}, SKU: {product_sku}"
+                "Checking product: %s, GPU: %s, Manufacturer: %s, SKU: %s",
+                product.get("productTitle"), gpu, config.manufacturer, product_sku,
             )
 
-            # Filter by manufacturer and GPU
-            if manufacturer == config.manufacturer and gpu in config.gpus_to_monitor:
-                if product_sku != config.last_known_skus.get(gpu, ""):
-                    if config.last_known_skus.get(gpu, "") == "":
-                        logger.info(f"Sending test email {gpu}: {product_sku}")
-                        body: str = f"<p>SKU set for {gpu} to: {product_sku}</p>"
-                        send_email(config.test_email_subject, body)
-                    elif config.last_known_skus.get(gpu, "") != "":
-                        logger.info(f"New SKU detected for {gpu}: {product_sku}")
-                        # Email for SKU Change
-                        body: str = f"<p>SKU changed for {gpu} to: {product_sku}</p>"
-                        send_email(config.product_email_subject, body)
-                    else:
-                        logger.info(f"Initial SKU detected for {gpu}: {product_sku}. No SKU change email sent on first run.") # Debugging first run
-
-                    config.last_known_skus[gpu] = product_sku  # Update last_known_skus
-                    config.sku_changed[gpu] = True # Set sku_changed to True
-
-                if config.sku_changed[gpu]:
-                    if check_inventory_api(product_sku):
-                         # Find the first retailer and send email
-                        retailers = product.get("retailers", [])
-                        if retailers: # Check if retailers list is not empty
-                            purchase_link: Optional[str] = retailers[0].get("purchaseLink") # Get the first retailer's purchase link
-                            if purchase_link: # Check if purchase_link is not None
-                                logger.info(f"Product with SKU {product_sku} is active and purchase link found. Sending email.") # Debugging
-                                body: str = (
-                                    f"<p>Product in stock! Link: "
-                                    f"<a href='{purchase_link}'>Click here</a></p>"
-                                )
-                                send_email(config.product_email_subject, body)
-                                config.sku_changed[gpu] = False  # Reset sku_changed after successful notification
-                                return # We only send one email per new SKU and is_active
-                            else:
-                                logger.warning(f"No purchase link found for SKU {product_sku} even though inventory API returned active.") # Debugging
-                        else:
-                            logger.warning(f"No retailers found for SKU {product_sku} even though inventory API returned active.") # Debugging
+            if product_sku != last_sku:
+                if last_sku == "":
+                    logger.info("Sending test email %s: %s", gpu, product_sku)
+                    body: str = f"<p>SKU set for {gpu} to: {product_sku}</p>"
+                    send_email(config.test_email_subject, body)
+                elif last_sku != "":
+                    logger.info("New SKU detected for %s: %s", gpu, product_sku)
+                    # Email for SKU Change
+                    body: str = f"<p>SKU changed for {gpu} to: {product_sku}</p>"
+                    send_email(config.product_email_subject, body)
+                else:
+                    logger.info("Initial SKU detected for %s: %s. No SKU change email sent on first run.", gpu, product_sku) # Debugging first run
+
+                last_known_skus[gpu] = product_sku  # Update last_known_skus
+                sku_changed[gpu] = True # Set sku_changed to True
+        return True
+
+    except Exception as e:
+        logger.error("Error processing API response: %s", e)
+        logger.debug("Problematic API response: %s", api_response)
+        return False
+
+
+def check_pending_inventory() -> None:
+    """Checks the inventory of products whose SKU changed and sends an email once one is in stock.
+
+    Runs on every check, including when the API response is unchanged, since stock can change
+    without the product listing changing.
+    """
+    try:
+        pending: Dict[str, Tuple[str, Any]] = {  # {gpu: (sku, product)} awaiting an inventory check
+            gpu: (product.get("productSKU", ""), product)
+            for gpu, product in tracked_products.items()
+            if sku_changed[gpu]
+        }
 
+        if pending:
+            # One inventory request for every SKU awaiting a check
+            inventory: Dict[str, bool] = check_inventory_api_batch([sku for sku, _ in pending.values()])
+            for gpu, (product_sku, product) in pending.items():
+                if inventory.get(product_sku, False):
+                     # Find the first retailer and send email
+                    retailers = product.get("retailers", [])
+                    if retailers: # Check if retailers list is not empty
+                        purchase_link: Optional[str] = retailers[0].get("purchaseLink") # Get the first retailer's purchase link
+                        if purchase_link: # Check if purchase_link is not None
+                            logger.info("Product with SKU %s is active and purchase link found. Sending email.", product_sku) # Debugging
+                            body: str = (
+                                f"<p>Product in stock! Link: "
+                                f"<a href='{purchase_link}'>Click here</a></p>"
+                            )
+                            send_email(config.product_email_subject, body)
+                            sku_changed[gpu] = False  # Reset sku_changed after successful notification
+                            return # We only send one email per new SKU and is_active
+                        else:
+                            logger.warning("No purchase link found for SKU %s even though inventory API returned active.", product_sku) # Debugging
                     else:
-                        logger.debug(f"Product with SKU {product_sku} is not active.")
+                        logger.warning("No retailers found for SKU %s even though inventory API returned active.", product_sku) # Debugging
+
+                else:
+                    logger.debug("Product with SKU %s is not active.", product_sku)
 
         logger.info("No new products in stock.")
 
     except Exception as e:
-        logger.error(f"Error processing API response: {e}")
-        logger.debug(f"Problematic API response: {api_response}")
+        logger.error("Error checking inventory: %s", e)
 
 
-def main() -> None:
-    """Main loop that checks the API and sends email alerts."""
+def poll_api() -> None:
+    """Polls the API every check_interval seconds and sends email alerts.
+
+    Checks are scheduled on a fixed monotonic cadence, so the time spent checking does not
+    push every following check later. Slots missed by a check that overran are skipped rather
+    than caught up, so a slow or failing API is never hit with back-to-back checks.
+    """
     failure_count: int = 0
+    next_check: float = time.monotonic()
 
-    logger.info("Starting API monitoring...")
     while True:
         api_response: Any = check_api()
 
         if api_response is None:
             failure_count += 1
-            logger.warning(f"API call failed. Current consecutive failures: {failure_count}")
+            logger.warning("API call failed after retries. Current consecutive failures: %s", failure_count)
 
             if failure_count >= config.max_failures:
-                body: str = "<p>Alert: The API is down. Please check the API status and connectivity.</p>"
-                send_email(config.down_email_subject, body)
+                send_down_email()
                 failure_count = 0
         else:
             failure_count = 0
-            process_api_response(api_response)  # Process the API response
+            if api_response is UNCHANGED:
+                logger.debug("API response unchanged since the last check.")
+            else:
+                if process_api_response(api_response):  # Process the API response
+                    mark_api_response_processed()
+            check_pending_inventory()
+
+        next_check += config.check_interval
+        now: float = time.monotonic()
+        if next_check <= now:
+            missed: int = int((now - next_check) // config.check_interval) + 1
+            logger.warning("API check overran its schedule. Skipping %d missed check(s).", missed)
+            next_check += missed * config.check_interval
+        delay: float = next_check - now
+        # Fetch the next response shortly before the check so it is fresh but already downloaded
+        lead: float = max_cache_age() / 2
+        if delay > lead:
+            schedule_refresh(config.api_url, config.get_headers(), delay - lead)
+        logger.info("Waiting for %.1f seconds before the next API check.", delay)
+        time.sleep(delay)
+
+
+# Put on the event queue when the server closes the event stream
+_STREAM_END: object = object()
+
+
+def _iter_stream_lines(response: requests.Response) -> Iterator[str]:
+    """Yields the lines of a streaming response as soon as each one arrives.
+
+    requests' iter_lines waits for a full chunk before yielding, which would hold back events.
+
+    Args:
+        response (requests.Response): The open streaming response.
+
+    Yields:
+        str: Each decoded line, without its line ending.
+
+    Raises:
+        requests.exceptions.ConnectionError: If reading from the connection fails.
+    """
+    pending: bytes = b""
+    try:
+        while True:
+            chunk: bytes = response.raw.read1(65536, decode_content=True)
+            if not chunk:
+                break
+            lines: List[bytes] = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line.rstrip(b"\r").decode(response.encoding or "utf-8")
+    except (urllib3.exceptions.HTTPError, OSError) as e:
+        raise requests.exceptions.ConnectionError(e)
+    if pending:
+        yield pending.rstrip(b"\r").decode(response.encoding or "utf-8")
+
+
+def _read_events(response: requests.Response, events: "queue.Queue[Any]") -> None:
+    """Reads a server-sent events stream and queues the parsed JSON data of each event.
+
+    Queues _STREAM_END when the server closes the stream, or a RequestException if reading fails.
+
+    Args:
+        response (requests.Response): The open streaming response.
+        events (queue.Queue[Any]): The queue to put events on.
+    """
+    try:
+        data_lines: List[str] = []
+        for line in _iter_stream_lines(response):
+            if line.startswith("data:"):
+                data_lines.append(line[5:].lstrip(" "))
+            elif not line and data_lines:  # A blank line ends the event
+                data: str = "\n".join(data_lines)
+                data_lines = []
+                try:
+                    events.put(json.loads(data))
+                except ValueError as e:
+                    logger.warning("Ignoring event with invalid JSON data: %s", e)
+        events.put(_STREAM_END)
+    except Exception as e:
+        events.put(e if isinstance(e, requests.exceptions.RequestException) else requests.exceptions.ConnectionError(e))
+
+
+def listen_for_events() -> None:
+    """Subscribes to a server-sent events stream and processes every API response pushed on it.
+
+    Each event's data must be the same JSON document the search API returns. While the stream
+    is open, SKUs waiting for stock are still checked every check_interval seconds. The stream
+    is reopened after check_interval seconds whenever it drops; failures only reset once an
+    event has been processed.
+    """
+    failure_count: int = 0
+
+    while True:
+        try:
+            # Reconnect if the stream stays silent for five minutes
+            with SESSION.get(
+                config.events_url, headers={"accept": "text/event-stream"}, stream=True, timeout=(10, 300)
+            ) as response:
+                response.raise_for_status()
+                logger.info("Connected to event stream at %s.", config.events_url)
+
+                events: "queue.Queue[Any]" = queue.Queue()
+                threading.Thread(target=_read_events, args=(response, events), daemon=True).start()
+                next_check: float = time.monotonic() + config.check_interval
+                while True:
+                    try:
+                        item: Any = events.get(timeout=max(0.0, next_check - time.monotonic()))
+                    except queue.Empty:
+                        check_pending_inventory()
+                        next_check = time.monotonic() + config.check_interval
+                        continue
+
+                    if item is _STREAM_END:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    process_api_response(item)
+                    check_pending_inventory()
+                    failure_count = 0
+                    next_check = time.monotonic() + config.check_interval
+
+            logger.warning("Event stream closed by the server.")
+        except requests.exceptions.RequestException as e:
+            logger.warning("Event stream failed: %s", e)
+
+        failure_count += 1
+        logger.warning("Current consecutive event stream failures: %s", failure_count)
+        if failure_count >= config.max_failures:
+            send_down_email()
+            failure_count = 0
 
-        logger.info(f"Waiting for {config.check_interval} seconds before the next API check.")
+        logger.info("Reconnecting to the event stream in %s seconds.", config.check_interval)
         time.sleep(config.check_interval)
 
 
+def main() -> None:
+    """Starts monitoring in the configured mode and sends email alerts."""
+    logger.info("Starting API monitoring...")
+    if config.mode == "webhook":
+        if config.events_url:
+            listen_for_events()
+            return
+        logger.error("mode = webhook requires events_url to be set in config.ini. Falling back to polling.")
+    elif config.mode != "poll":
+        logger.error("Unknown mode '%s' in config.ini. Falling back to polling.", config.mode)
+    poll_api()
+
+
 if __name__ == "__main__":
     main()